@@ -6,6 +6,7 @@
 Gaussian Basis Set verdi command line interface
 """
 
+import itertools
 import sys
 
 import click
@@ -20,43 +21,79 @@ from ..utils import click_parse_range
 if not hasattr(echo, "echo_report"):  # monkeypatch the new echo_report in old versions of aiida
     echo.echo_report = echo.echo_info
 
+_BOLD = "\033[1m"
+_RESET = "\033[0m"
+_TABLE_HEADERS_IMPORT = ("Nr.", "Sym", "Names", "Tags", "# Val. e⁻", "Version")
+_TABLE_HEADERS_LIST = ("ID", "Sym", "Names", "Tags", "# Val. e⁻", "Version")
+
 
 def _names_column(name, aliases):
-    return ", ".join(["\033[1m{}\033[0m".format(name), *[a for a in aliases if a != name]])
+    return f"{_BOLD}{name}{_RESET}" + "".join(f", {a}" for a in aliases if a != name)
+
+
+def _row(key, element, name, aliases, tags, n_el, version):
+    """the table row shared by the import and list tables, the first column is the number or ID of the entry"""
+    return (
+        key,
+        element,
+        _names_column(name, aliases),
+        ", ".join(tags),
+        n_el if n_el else "<unknown>",
+        version,
+    )
 
 
 def _formatted_table_import(bsets):
     """generates a formatted table (using tabulate) for the given list of basis sets, shows a sequencial number"""
 
-    def row(num, bset):
-        return (
-            num + 1,
-            bset.element,
-            _names_column(bset.name, bset.aliases),
-            ", ".join(bset.tags),
-            bset.n_el if bset.n_el else "<unknown>",
-            bset.version,
-        )
+    table_content = (_row(n + 1, b.element, b.name, b.aliases, b.tags, b.n_el, b.version) for n, b in enumerate(bsets))
+    return tabulate.tabulate(
+        table_content,
+        headers=_TABLE_HEADERS_IMPORT,
+        disable_numparse=[1, 2, 3],  # skip the number detection for the text-only columns
+    )
+
 
-    table_content = [row(n, b) for n, b in enumerate(bsets)]
-    return tabulate.tabulate(table_content, headers=["Nr.", "Sym", "Names", "Tags", "# Val. e⁻", "Version"])
+_LIST_PROJECTIONS = [
+    "uuid",
+    "attributes.element",
+    "attributes.name",
+    "attributes.aliases",
+    "attributes.tags",
+    "attributes.n_el",
+    "attributes.version",
+]
 
 
 def _formatted_table_list(bsets):
-    """generates a formatted table (using tabulate) for the given list of basis sets, shows the UUID"""
+    """
+    generates a formatted table (using tabulate) for the given list of basis sets, shows the UUID
+
+    :param bsets: rows of attributes as projected by ``_LIST_PROJECTIONS``
+    """
+
+    table_content = (_row(*b) for b in bsets)
+    return tabulate.tabulate(
+        table_content,
+        headers=_TABLE_HEADERS_LIST,
+        disable_numparse=[0, 1, 2, 3],  # skip the number detection for the text-only columns
+    )
 
-    def row(bset):
-        return (
-            bset.uuid,
-            bset.element,
-            _names_column(bset.name, bset.aliases),
-            ", ".join(bset.tags),
-            bset.n_el if bset.n_el else "<unknown>",
-            bset.version,
-        )
 
-    table_content = [row(b) for b in bsets]
-    return tabulate.tabulate(table_content, headers=["ID", "Sym", "Names", "Tags", "# Val. e⁻", "Version"])
+def _query_filters(sym, name, tags):
+    """build the QueryBuilder filters for the given list/dump options as a single dict"""
+    filters = {}
+
+    if sym:
+        filters["attributes.element"] = {"==": sym}
+
+    if name:
+        filters["attributes.aliases"] = {"contains": [name]}
+
+    if tags:
+        filters["attributes.tags"] = {"contains": tags}
+
+    return filters
 
 
 @verdi_data.group("gaussian.basisset")
@@ -94,9 +131,11 @@ def import_basisset(basisset_file, fformat, sym, tags, duplicates, group):
         "cp2k": BasisSet.from_cp2k,
     }
 
+    tagset = frozenset(tags)
+
     filters = {
         'element': lambda x: not sym or x == sym,
-        'tags': lambda x: not tags or set(tags).issubset(x),
+        'tags': lambda x: not tagset or tagset.issubset(x),
     }
 
     bsets = loaders[fformat](basisset_file, filters, duplicates)
@@ -105,25 +144,30 @@ def import_basisset(basisset_file, fformat, sym, tags, duplicates, group):
         echo.echo_report("No valid Gaussian Basis Sets found in the given file matching the given criteria")
         return
 
-    if len(bsets) == 1:
+    count = len(bsets)
+
+    if count == 1:
         bset = bsets[0]
-        click.confirm("Add a Gaussian Basis Set for '{b.element}' from '{b.name}'?".format(b=bset), abort=True)
+        click.confirm(f"Add a Gaussian Basis Set for '{bset.element}' from '{bset.name}'?", abort=True)
         bset.store()
 
     else:
-        echo.echo_report("{} Gaussian Basis Sets found:\n".format(len(bsets)))
+        echo.echo_report(f"{count} Gaussian Basis Sets found:\n")
         echo.echo(_formatted_table_import(bsets))
         echo.echo("")
 
         indexes = click.prompt(
             "Which Gaussian Basis Set do you want to add?"
             " ('n' for none, 'a' for all, comma-seperated list or range of numbers)",
-            value_proc=lambda v: click_parse_range(v, len(bsets)))
+            value_proc=lambda v: click_parse_range(v, count))
+
+        selected = [bsets[idx] for idx in indexes]
+
+        for bset in selected:
+            echo.echo_report(f"Adding Gaussian Basis Set for: {bset.element} ({bset.name})")
 
-        for idx in indexes:
-            echo.echo_report("Adding Gaussian Basis Set for: {b.element} ({b.name})... ".format(b=bsets[idx]), nl=False)
-            bsets[idx].store()
-            echo.echo("DONE")
+        store_in_transaction(selected)
+        echo.echo_success(f"Added {len(selected)} Gaussian Basis Sets")
 
     if group:
         echo.echo_report(f"The created Gaussian Basis Set nodes were added to group '{group.label}'")
@@ -147,23 +191,16 @@ def list_basisset(sym, name, tags):
     from aiida_gaussian_datatypes.basisset.data import BasisSet
 
     query = QueryBuilder()
-    query.append(BasisSet)
+    query.append(BasisSet, filters=_query_filters(sym, name, tags), project=_LIST_PROJECTIONS)
 
-    if sym:
-        query.add_filter(BasisSet, {'attributes.element': {'==': sym}})
-
-    if name:
-        query.add_filter(BasisSet, {'attributes.aliases': {'contains': [name]}})
+    bsets = query.all()
 
-    if tags:
-        query.add_filter(BasisSet, {'attributes.tags': {'contains': tags}})
-
-    if not query.count():
+    if not bsets:
         echo.echo("No Gaussian Basis Sets found.")
         return
 
-    echo.echo_report("{} Gaussian Basis Sets found:\n".format(query.count()))
-    echo.echo(_formatted_table_list(bs for [bs] in query.iterall()))
+    echo.echo_report(f"{len(bsets)} Gaussian Basis Sets found:\n")
+    echo.echo(_formatted_table_list(bsets))
     echo.echo("")
 
 
@@ -185,8 +222,6 @@ def dump_basisset(sym, name, tags, output_format, data):
     Print specified Basis Sets
     """
 
-    from aiida.orm.querybuilder import QueryBuilder
-
     from aiida_gaussian_datatypes.basisset.data import BasisSet
 
     writers = {
@@ -198,26 +233,26 @@ def dump_basisset(sym, name, tags, output_format, data):
         if sym or name or tags:
             raise click.UsageError("can not specify node IDs and filters at the same time")
     else:
-        query = QueryBuilder()
-        query.append(BasisSet, project=['*'])
+        from aiida.orm.querybuilder import QueryBuilder
 
-        if sym:
-            query.add_filter(BasisSet, {'attributes.element': {'==': sym}})
+        query = QueryBuilder()
+        query.append(BasisSet, filters=_query_filters(sym, name, tags), project=['*'])
 
-        if name:
-            query.add_filter(BasisSet, {'attributes.aliases': {'contains': [name]}})
+        data = (bset for bset, in query.iterall())  # query always returns a tuple, unpack it here
 
-        if tags:
-            query.add_filter(BasisSet, {'attributes.tags': {'contains': tags}})
+        first = next(data, None)
 
-        if not query.count():
+        if first is None:
             echo.echo_warning("No Gaussian Basis Sets found.", err=echo.is_stdout_redirected())
             return
 
-        data = [bset for bset, in query.iterall()]  # query always returns a tuple, unpack it here
+        data = itertools.chain([first], data)
+
+    writer = writers[output_format]
+    redirected = echo.is_stdout_redirected()
 
     for bset in data:
-        if echo.is_stdout_redirected():
-            echo.echo_report("Dumping {}/{} ({})...".format(bset.name, bset.element, bset.uuid), err=True)
+        if redirected:
+            echo.echo_report(f"Dumping {bset.name}/{bset.element} ({bset.uuid})...", err=True)
 
-        writers[output_format](bset, sys.stdout)
+        writer(bset, sys.stdout)
@@ -6,8 +6,8 @@
 Gaussian Basis Set Data Class
 """
 
-from decimal import Decimal
-from typing import Any, Dict
+import json
+from typing import Any, Callable, Dict, List, Tuple
 
 from aiida.common.exceptions import (
     MultipleObjectsError,
@@ -15,9 +15,13 @@ from aiida.common.exceptions import (
     UniquenessError,
     ValidationError,
 )
-from aiida.orm import Data, Group
+from aiida.orm import Data, Group, QueryBuilder, load_node
 from cp2k_input_tools.basissets import BasisSetData
 
+from ..utils import store_in_transaction  # pylint: disable=relative-beyond-top-level
+
+_SCALAR_FIELDS = frozenset(("element", "name", "version"))
+
 
 class BasisSet(Data):
     """
@@ -48,13 +52,17 @@ class BasisSet(Data):
 
         super(BasisSet, self).__init__(**kwargs)
 
-        self.set_attribute("name", name)
-        self.set_attribute("element", element)
-        self.set_attribute("tags", tags)
-        self.set_attribute("aliases", aliases)
-        self.set_attribute("n_el", n_el)
-        self.set_attribute("blocks", blocks)
-        self.set_attribute("version", version)
+        self.set_attribute_many(
+            {
+                "name": name,
+                "element": element,
+                "tags": tags,
+                "aliases": aliases,
+                "n_el": n_el,
+                "blocks": blocks,
+                "version": version,
+            }
+        )
 
     def store(self, *args, **kwargs):
         """
@@ -62,14 +70,22 @@ class BasisSet(Data):
         """
         # TODO: this uniqueness check is not race-condition free.
 
-        try:
-            existing = self.get(self.element, self.name, self.version, match_aliases=False)
-        except NotExistent:
-            pass
-        else:
+        query = QueryBuilder()
+        query.append(
+            BasisSet,
+            filters={
+                "attributes.element": {"==": self.element},
+                "attributes.name": {"==": self.name},
+                "attributes.version": {"==": self.version},
+            },
+            project=["uuid"],
+        )
+        existing = query.first()
+
+        if existing:
             raise UniquenessError(
                 f"Gaussian Basis Set already exists for"
-                f" element={self.element}, name={self.name}, version={self.version}: {existing.uuid}"
+                f" element={self.element}, name={self.name}, version={self.version}: {existing[0]}"
             )
 
         return super(BasisSet, self).store(*args, **kwargs)
@@ -77,18 +93,21 @@ class BasisSet(Data):
     def _validate(self):
         super(BasisSet, self)._validate()
 
+        attributes = self.attributes
+
         try:
             # directly raises an exception for the data if something's amiss, extra fields are ignored
-            _dict2basissetdata(self.attributes)
+            _dict2basissetdata(attributes)
 
-            assert isinstance(self.name, str) and self.name
-            assert (
-                isinstance(self.aliases, list)
-                and all(isinstance(alias, str) for alias in self.aliases)
-                and self.aliases
-            )
-            assert isinstance(self.tags, list) and all(isinstance(tag, str) for tag in self.tags)
-            assert isinstance(self.version, int) and self.version > 0
+            name = attributes.get("name")
+            aliases = attributes.get("aliases", [])
+            tags = attributes.get("tags", [])
+            version = attributes.get("version")
+
+            assert isinstance(name, str) and name
+            assert isinstance(aliases, list) and all(isinstance(alias, str) for alias in aliases) and aliases
+            assert isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)
+            assert isinstance(version, int) and version > 0
         except Exception as exc:
             raise ValidationError("One or more invalid fields found") from exc
 
@@ -189,8 +208,6 @@ class BasisSet(Data):
 
     @classmethod
     def get(cls, element, name=None, version="latest", match_aliases=True, group_label=None, n_el=None):
-        from aiida.orm.querybuilder import QueryBuilder
-
         query = QueryBuilder()
 
         params = {}
@@ -199,8 +216,6 @@ class BasisSet(Data):
             query.append(Group, filters={"label": group_label}, tag="group")
             params["with_group"] = "group"
 
-        query.append(BasisSet, **params)
-
         filters = {"attributes.element": {"==": element}}
 
         if version != "latest":
@@ -215,81 +230,104 @@ class BasisSet(Data):
         if n_el:
             filters["attributes.n_el"] = {"==": n_el}
 
-        query.add_filter(BasisSet, filters)
+        query.append(BasisSet, filters=filters, project=["attributes.name", "attributes.version", "id"], **params)
 
         # SQLA ORM only solution:
         # query.order_by({BasisSet: [{"attributes.version": {"cast": "i", "order": "desc"}}]})
         # items = query.first()
 
-        items = sorted(query.iterall(), key=lambda b: b[0].version, reverse=True)
+        items = query.all()
 
         if not items:
             raise NotExistent(f"No Gaussian Basis Set found for element={element}, name={name}, version={version}")
 
         # if we get different names there is no well ordering, sorting by version only works if they have the same name
-        if len(set(b[0].name for b in items)) > 1:
+        if any(b[0] != items[0][0] for b in items[1:]):
             raise MultipleObjectsError(
                 f"Multiple Gaussian Basis Set found for element={element}, name={name}, version={version}"
             )
 
-        return items[0][0]
+        return load_node(max(items, key=lambda b: b[1])[2])
 
     @classmethod
-    def from_cp2k(cls, fhandle, filters=None, duplicate_handling="ignore"):
+    def _get_latest_versions(cls, bsets):
+        """
+        Get the latest stored version and UUID for each (element, name) of the given basis set dicts in one query.
+
+        :param bsets: list of dicts with at least the keys "element" and "name"
+        :return: a dict mapping (element, name) to a tuple (version, uuid)
+        """
+        latest = {}
+
+        if not bsets:
+            return latest
+
+        query = QueryBuilder()
+        query.append(
+            BasisSet,
+            filters={
+                "attributes.element": {"in": list({bs["element"] for bs in bsets})},
+                "attributes.name": {"in": list({bs["name"] for bs in bsets})},
+            },
+            project=["attributes.element", "attributes.name", "attributes.version", "uuid"],
+        )
+
+        for element, name, version, uuid in query.iterall():
+            if (element, name) not in latest or latest[element, name][0] < version:
+                latest[element, name] = (version, uuid)
+
+        return latest
+
+    @classmethod
+    def from_cp2k(cls, fhandle, filters=None, duplicate_handling="ignore", store=False):
         """
         Constructs a list with basis set objects from a Basis Set in CP2K format
 
         :param fhandle: open file handle
         :param filters: a dict with attribute filter functions
         :param duplicate_handling: how to handle duplicates ("ignore", "error", "new" (version))
+        :param store: whether to also store all the returned nodes, in a single transaction
         :rtype: list
         """
-        if not filters:
-            filters = {}
+        if duplicate_handling not in ("ignore", "error", "new"):
+            raise ValueError(f"Specified duplicate handling strategy not recognized: '{duplicate_handling}'")
+
+        bsets = (_basissetdata2dict(bs) for bs in BasisSetData.datafile_iter(fhandle))
+
+        if filters:
+            # check the filters on the scalar fields first since they are the cheapest and reject most of the entries
+            filters = sorted(filters.items(), key=lambda item: item[0] not in _SCALAR_FIELDS)
+            bsets = (bs for bs in bsets if _matches_criteria(bs, filters))
+
+        bsets = list(bsets)
+
+        latest = cls._get_latest_versions(bsets)
 
-        def matches_criteria(bset):
-            return all(fspec(bset[field]) for field, fspec in filters.items())
+        nodes = []
 
-        def exists(bset):
+        for bset in bsets:
             try:
-                cls.get(bset["element"], bset["name"], match_aliases=False)
-            except NotExistent:
-                return False
-
-            return True
-
-        bsets = [
-            bs for bs in (_basissetdata2dict(bs) for bs in BasisSetData.datafile_iter(fhandle)) if matches_criteria(bs)
-        ]
-
-        if duplicate_handling == "ignore":  # simply filter duplicates
-            bsets = [bs for bs in bsets if not exists(bs)]
-
-        elif duplicate_handling == "error":
-            for bset in bsets:
-                try:
-                    latest = cls.get(bset["element"], bset["name"], match_aliases=False)
-                except NotExistent:
-                    pass
-                else:
+                version, uuid = latest[bset["element"], bset["name"]]
+            except KeyError:
+                pass
+            else:
+                if duplicate_handling == "ignore":  # simply skip duplicates
+                    continue
+
+                if duplicate_handling == "error":
                     raise UniquenessError(
                         f"Gaussian Basis Set already exists for"
-                        f" element={bset['element']}, name={bset['name']}: {latest.uuid}"
+                        f" element={bset['element']}, name={bset['name']}: {uuid}"
                     )
 
-        elif duplicate_handling == "new":
-            for bset in bsets:
-                try:
-                    latest = cls.get(bset["element"], bset["name"], match_aliases=False)
-                except NotExistent:
-                    pass
-                else:
-                    bset["version"] = latest.version + 1
+                bset["version"] = version + 1
 
-        else:
-            raise ValueError(f"Specified duplicate handling strategy not recognized: '{duplicate_handling}'")
+            nodes.append(cls(**bset))
 
-        return [cls(**bs) for bs in bsets]
+        if store:
+            store_in_transaction(nodes)
+
+        return nodes
 
     def to_cp2k(self, fhandle):
         """
@@ -298,9 +336,9 @@ class BasisSet(Data):
         :param fhandle: A valid output file handle
         """
         fhandle.write(f"# from AiiDA BasisSet<uuid: {self.uuid}>\n")
-        for line in _dict2basissetdata(self.attributes).cp2k_format_line_iter():
-            fhandle.write(line)
-            fhandle.write("\n")
+        # the attributes are only converted to the model and never handed out, so no copy of them is needed
+        data = _dict2basissetdata(self.backend_entity.attributes)
+        fhandle.write("".join(f"{line}\n" for line in data.cp2k_format_line_iter()))
 
     def get_matching_pseudopotential(self, *args, **kwargs):
         """
@@ -315,6 +353,11 @@ class BasisSet(Data):
             return Pseudopotential.get(element=self.element, *args, **kwargs)
 
 
+def _matches_criteria(entry: Dict[str, Any], filters: List[Tuple[str, Callable[[Any], bool]]]) -> bool:
+    """check whether the given parsed entry passes all the (field, filter function) pairs, in the given order"""
+    return all(fspec(entry[field]) for field, fspec in filters)
+
+
 def _basissetdata2dict(data: BasisSetData) -> Dict[str, Any]:
     """
     Convert a BasisSetData to a compatible dict with:
@@ -323,23 +366,10 @@ def _basissetdata2dict(data: BasisSetData) -> Dict[str, Any]:
     * the key "coefficients" replaced with "coeffs"
     """
 
-    bset_dict = data.dict()
-    stack = [bset_dict]
-    while stack:
-        current = stack.pop()
-        for key, val in current.items():
-            if isinstance(val, dict):
-                stack.append(val)
-            elif isinstance(val, Decimal):
-                current[key] = str(val)
-            elif isinstance(val, list) and val and isinstance(val[0], dict):
-                stack += val
-            elif (
-                isinstance(val, list) and val and isinstance(val[0], list) and val[0] and isinstance(val[0][0], Decimal)
-            ):
-                current[key] = [[str(w) for w in v] for v in val]
-
-    bset_dict["aliases"] = sorted(bset_dict.pop("identifiers"), key=lambda i: -len(i))
+    # the JSON round trip converts the Decimals in all nested models to strings
+    bset_dict = json.loads(json.dumps(data.dict(), default=str))
+
+    bset_dict["aliases"] = sorted(bset_dict.pop("identifiers"), key=len, reverse=True)
     bset_dict["name"] = bset_dict["aliases"][0]
     bset_dict["tags"] = bset_dict["name"].split("-")
 
@@ -41,13 +41,18 @@ class _MemberMixin(Generic[_T]):
         query = (
             QueryBuilder()
             .append(self.__class__, filters={"id": self.pk}, tag="group")
-            .append(self.member_type, with_group="group", filters={"attributes.element": {"in": elements}})
+            .append(
+                self.member_type,
+                with_group="group",
+                filters={"attributes.element": {"in": elements}},
+                project=["attributes.element", "*"],
+            )
         )
 
         pseudos: Dict[str, List[_T]] = {}
 
-        for (pseudo,) in query.iterall():
-            pseudos.setdefault(pseudo.element, []).append(pseudo)
+        for element, pseudo in query.iterall():
+            pseudos.setdefault(element, []).append(pseudo)
 
         return pseudos
 
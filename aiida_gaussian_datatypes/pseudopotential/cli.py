@@ -6,6 +6,7 @@
 Gaussian Pseudopotential verdi command line interface
 """
 
+import itertools
 import sys
 
 import click
@@ -15,48 +16,94 @@ from aiida.cmdline.params import arguments, options
 from aiida.cmdline.params.types import DataParamType, GroupParamType
 from aiida.cmdline.utils import decorators, echo
 
-from ..utils import click_parse_range  # pylint: disable=relative-beyond-top-level
+from ..utils import click_parse_range, store_in_transaction  # pylint: disable=relative-beyond-top-level
 
 if not hasattr(echo, "echo_report"):  # monkeypatch the new echo_report in old versions of aiida
     echo.echo_report = echo.echo_info
 
+_BOLD = "\033[1m"
+_RESET = "\033[0m"
+_TABLE_HEADERS_IMPORT = ("Nr.", "Sym", "Names", "Tags", "Val. e⁻ (s, p, ..)", "Version")
+_TABLE_HEADERS_LIST = ("ID", "Sym", "Names", "Tags", "Val. e⁻ (s, p, ..)", "Version")
+_N_EL_PADDING = (0, 0, 0)  # always show at least the s, p and d shells
+_N_EL_FORMAT = "{:2d}, {:2d}, {:2d}".format
+
 
 def _names_column(name, aliases):
-    return ", ".join(["\033[1m{}\033[0m".format(name), *[a for a in aliases if a != name]])
+    return f"{_BOLD}{name}{_RESET}" + "".join(f", {a}" for a in aliases if a != name)
+
+
+def _n_el_column(n_el):
+    if len(n_el) <= len(_N_EL_PADDING):
+        return _N_EL_FORMAT(*n_el, *_N_EL_PADDING[len(n_el) :])
+    return ", ".join(f"{n:2d}" for n in n_el)
+
+
+def _row(key, element, name, aliases, tags, n_el, version):
+    """the table row shared by the import and list tables, the first column is the number or ID of the entry"""
+    return (
+        key,
+        element,
+        _names_column(name, aliases),
+        ", ".join(tags),
+        _n_el_column(n_el),
+        version,
+    )
 
 
 def _formatted_table_import(pseudos):
     """generates a formatted table (using tabulate) for the given list of pseudopotentials, shows a sequencial number"""
 
-    def row(num, pseudo):
-        return (
-            num + 1,
-            pseudo.element,
-            _names_column(pseudo.name, pseudo.aliases),
-            ", ".join(pseudo.tags),
-            ", ".join(f"{n:2d}" for n in pseudo.n_el + (3 - len(pseudo.n_el)) * [0]),
-            pseudo.version,
-        )
+    table_content = (
+        _row(n + 1, p.element, p.name, p.aliases, p.tags, p.n_el, p.version) for n, p in enumerate(pseudos)
+    )
+    return tabulate.tabulate(
+        table_content,
+        headers=_TABLE_HEADERS_IMPORT,
+        disable_numparse=[1, 2, 3, 4],  # skip the number detection for the text-only columns
+    )
+
 
-    table_content = [row(n, p) for n, p in enumerate(pseudos)]
-    return tabulate.tabulate(table_content, headers=["Nr.", "Sym", "Names", "Tags", "Val. e⁻ (s, p, ..)", "Version"])
+_LIST_PROJECTIONS = [
+    "uuid",
+    "attributes.element",
+    "attributes.name",
+    "attributes.aliases",
+    "attributes.tags",
+    "attributes.n_el",
+    "attributes.version",
+]
 
 
 def _formatted_table_list(pseudos):
-    """generates a formatted table (using tabulate) for the given list of pseudopotentials, shows the UUIID"""
+    """
+    generates a formatted table (using tabulate) for the given list of pseudopotentials, shows the UUIID
+
+    :param pseudos: rows of attributes as projected by ``_LIST_PROJECTIONS``
+    """
+
+    table_content = (_row(*p) for p in pseudos)
+    return tabulate.tabulate(
+        table_content,
+        headers=_TABLE_HEADERS_LIST,
+        disable_numparse=[0, 1, 2, 3, 4],  # skip the number detection for the text-only columns
+    )
+
+
+def _query_filters(sym, name, tags):
+    """build the QueryBuilder filters for the given list/dump options as a single dict"""
+    filters = {}
+
+    if sym:
+        filters["attributes.element"] = {"==": sym}
+
+    if name:
+        filters["attributes.aliases"] = {"contains": [name]}
 
-    def row(pseudo):
-        return (
-            pseudo.uuid,
-            pseudo.element,
-            _names_column(pseudo.name, pseudo.aliases),
-            ", ".join(pseudo.tags),
-            ", ".join(f"{n:2d}" for n in pseudo.n_el + (3 - len(pseudo.n_el)) * [0]),
-            pseudo.version,
-        )
+    if tags:
+        filters["attributes.tags"] = {"contains": tags}
 
-    table_content = [row(p) for p in pseudos]
-    return tabulate.tabulate(table_content, headers=["ID", "Sym", "Names", "Tags", "Val. e⁻ (s, p, ..)", "Version"])
+    return filters
 
 
 @verdi_data.group("gaussian.pseudo")
@@ -99,9 +146,11 @@ def import_pseudo(pseudopotential_file, fformat, sym, tags, duplicates, ignore_i
         "cp2k": Pseudopotential.from_cp2k,
     }
 
+    tagset = frozenset(tags)
+
     filters = {
         'element': lambda x: not sym or x == sym,
-        'tags': lambda x: not tags or set(tags).issubset(x),
+        'tags': lambda x: not tagset or tagset.issubset(x),
     }
 
     pseudos = loaders[fformat](pseudopotential_file, filters, duplicates, ignore_invalid)
@@ -110,26 +159,30 @@ def import_pseudo(pseudopotential_file, fformat, sym, tags, duplicates, ignore_i
         echo.echo_report("No valid Gaussian Pseudopotentials found in the given file matching the given criteria")
         return
 
-    if len(pseudos) == 1:
+    count = len(pseudos)
+
+    if count == 1:
         pseudo = pseudos[0]
-        click.confirm("Add a Gaussian '{p.name}' Pseudopotential for '{p.element}'?".format(p=pseudo), abort=True)
+        click.confirm(f"Add a Gaussian '{pseudo.name}' Pseudopotential for '{pseudo.element}'?", abort=True)
         pseudo.store()
 
     else:
-        echo.echo_report("{} Gaussian Pseudopotentials found:\n".format(len(pseudos)))
+        echo.echo_report(f"{count} Gaussian Pseudopotentials found:\n")
         echo.echo(_formatted_table_import(pseudos))
         echo.echo("")
 
         indexes = click.prompt(
             "Which Gaussian Pseudopotentials do you want to add?"
             " ('n' for none, 'a' for all, comma-seperated list or range of numbers)",
-            value_proc=lambda v: click_parse_range(v, len(pseudos)))
+            value_proc=lambda v: click_parse_range(v, count))
+
+        selected = [pseudos[idx] for idx in indexes]
 
-        for idx in indexes:
-            echo.echo_report(
-                "Adding Gaussian Pseudopotentials for: {p.element} ({p.name})... ".format(p=pseudos[idx]), nl=False)
-            pseudos[idx].store()
-            echo.echo("DONE")
+        for pseudo in selected:
+            echo.echo_report(f"Adding Gaussian Pseudopotentials for: {pseudo.element} ({pseudo.name})")
+
+        store_in_transaction(selected)
+        echo.echo_success(f"Added {len(selected)} Gaussian Pseudopotentials")
 
     if group:
         echo.echo_report(f"The created Gaussian Pseudopotential nodes were added to group '{group.label}'")
@@ -152,23 +205,16 @@ def list_pseudo(sym, name, tags):
     from aiida_gaussian_datatypes.pseudopotential.data import Pseudopotential
 
     query = QueryBuilder()
-    query.append(Pseudopotential)
-
-    if sym:
-        query.add_filter(Pseudopotential, {'attributes.element': {'==': sym}})
-
-    if name:
-        query.add_filter(Pseudopotential, {'attributes.aliases': {'contains': [name]}})
+    query.append(Pseudopotential, filters=_query_filters(sym, name, tags), project=_LIST_PROJECTIONS)
 
-    if tags:
-        query.add_filter(Pseudopotential, {'attributes.tags': {'contains': tags}})
+    pseudos = query.all()
 
-    if not query.count():
+    if not pseudos:
         echo.echo("No Gaussian Pseudopotentials found.")
         return
 
-    echo.echo_report("{} Gaussian Pseudopotentials found:\n".format(query.count()))
-    echo.echo(_formatted_table_list(pseudo for [pseudo] in query.iterall()))
+    echo.echo_report(f"{len(pseudos)} Gaussian Pseudopotentials found:\n")
+    echo.echo(_formatted_table_list(pseudos))
     echo.echo("")
 
 
@@ -190,8 +236,6 @@ def dump_pseudo(sym, name, tags, output_format, data):
     Print specified Pseudopotentials
     """
 
-    from aiida.orm.querybuilder import QueryBuilder
-
     from aiida_gaussian_datatypes.pseudopotential.data import Pseudopotential
 
     writers = {
@@ -203,26 +247,26 @@ def dump_pseudo(sym, name, tags, output_format, data):
         if sym or name or tags:
             raise click.UsageError("can not specify node IDs and filters at the same time")
     else:
-        query = QueryBuilder()
-        query.append(Pseudopotential, project=["*"])
+        from aiida.orm.querybuilder import QueryBuilder
 
-        if sym:
-            query.add_filter(Pseudopotential, {"attributes.element": {"==": sym}})
+        query = QueryBuilder()
+        query.append(Pseudopotential, filters=_query_filters(sym, name, tags), project=["*"])
 
-        if name:
-            query.add_filter(Pseudopotential, {"attributes.aliases": {"contains": [name]}})
+        data = (pseudo for pseudo, in query.iterall())  # query always returns a tuple, unpack it here
 
-        if tags:
-            query.add_filter(Pseudopotential, {"attributes.tags": {"contains": tags}})
+        first = next(data, None)
 
-        if not query.count():
+        if first is None:
             echo.echo_warning("No Gaussian Pseudopotential found.", err=echo.is_stdout_redirected())
             return
 
-        data = [pseudo for pseudo, in query.iterall()]  # query always returns a tuple, unpack it here
+        data = itertools.chain([first], data)
+
+    writer = writers[output_format]
+    redirected = echo.is_stdout_redirected()
 
     for pseudo in data:
-        if echo.is_stdout_redirected():
-            echo.echo_report("Dumping {}/{} ({})...".format(pseudo.name, pseudo.element, pseudo.uuid), err=True)
+        if redirected:
+            echo.echo_report(f"Dumping {pseudo.name}/{pseudo.element} ({pseudo.uuid})...", err=True)
 
-        writers[output_format](pseudo, sys.stdout)
+        writer(pseudo, sys.stdout)
@@ -6,8 +6,8 @@
 Gaussian Pseudopotential Data class
 """
 
-from decimal import Decimal
-from typing import Any, Dict
+import json
+from typing import Any, Callable, Dict, List, Tuple
 
 from aiida.common.exceptions import (
     MultipleObjectsError,
@@ -15,9 +15,13 @@ from aiida.common.exceptions import (
     UniquenessError,
     ValidationError,
 )
-from aiida.orm import Data, Group
+from aiida.orm import Data, Group, QueryBuilder, load_node
 from cp2k_input_tools.pseudopotentials import PseudopotentialData
 
+from ..utils import store_in_transaction  # pylint: disable=relative-beyond-top-level
+
+_SCALAR_FIELDS = frozenset(("element", "name", "version"))
+
 
 class Pseudopotential(Data):
     """
@@ -68,8 +72,19 @@ class Pseudopotential(Data):
 
         super().__init__(**kwargs)
 
-        for attr in ("name", "element", "tags", "aliases", "n_el", "local", "non_local", "nlcc", "version"):
-            self.set_attribute(attr, locals()[attr])
+        self.set_attribute_many(
+            {
+                "name": name,
+                "element": element,
+                "tags": tags,
+                "aliases": aliases,
+                "n_el": n_el,
+                "local": local,
+                "non_local": non_local,
+                "nlcc": nlcc,
+                "version": version,
+            }
+        )
 
     def store(self, *args, **kwargs):
         """
@@ -77,14 +92,22 @@ class Pseudopotential(Data):
         """
         # TODO: this uniqueness check is not race-condition free.
 
-        try:
-            existing = self.get(self.element, self.name, self.version, match_aliases=False)
-        except NotExistent:
-            pass
-        else:
+        query = QueryBuilder()
+        query.append(
+            Pseudopotential,
+            filters={
+                "attributes.element": {"==": self.element},
+                "attributes.name": {"==": self.name},
+                "attributes.version": {"==": self.version},
+            },
+            project=["uuid"],
+        )
+        existing = query.first()
+
+        if existing:
             raise UniquenessError(
                 f"Gaussian Pseudopotential already exists for"
-                f" element={self.element}, name={self.name}, version={self.version}: {existing.uuid}"
+                f" element={self.element}, name={self.name}, version={self.version}: {existing[0]}"
             )
 
         return super().store(*args, **kwargs)
@@ -92,18 +115,21 @@ class Pseudopotential(Data):
     def _validate(self):
         super()._validate()
 
+        attributes = self.attributes
+
         try:
             # directly raises a ValidationError for the pseudo data if something's amiss
-            _dict2pseudodata(self.attributes)
+            _dict2pseudodata(attributes)
 
-            assert isinstance(self.name, str) and self.name
-            assert (
-                isinstance(self.aliases, list)
-                and all(isinstance(alias, str) for alias in self.aliases)
-                and self.aliases
-            )
-            assert isinstance(self.tags, list) and all(isinstance(tag, str) for tag in self.tags)
-            assert isinstance(self.version, int) and self.version > 0
+            name = attributes.get("name")
+            aliases = attributes.get("aliases", [])
+            tags = attributes.get("tags", [])
+            version = attributes.get("version")
+
+            assert isinstance(name, str) and name
+            assert isinstance(aliases, list) and all(isinstance(alias, str) for alias in aliases) and aliases
+            assert isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)
+            assert isinstance(version, int) and version > 0
         except Exception as exc:
             raise ValidationError("One or more invalid fields found") from exc
 
@@ -213,8 +239,6 @@ class Pseudopotential(Data):
         :param version: A specific version (if more than one in the database and not the highest/latest)
         :param match_aliases: Whether to look in the list of of aliases for a matching name
         """
-        from aiida.orm.querybuilder import QueryBuilder
-
         query = QueryBuilder()
 
         params = {}
@@ -223,8 +247,6 @@ class Pseudopotential(Data):
             query.append(Group, filters={"label": group_label}, tag="group")
             params["with_group"] = "group"
 
-        query.append(Pseudopotential, **params)
-
         filters = {"attributes.element": {"==": element}}
 
         if version != "latest":
@@ -236,7 +258,12 @@ class Pseudopotential(Data):
             else:
                 filters["attributes.name"] = {"==": name}
 
-        query.add_filter(Pseudopotential, filters)
+        query.append(
+            Pseudopotential,
+            filters=filters,
+            project=["attributes.name", "attributes.version", "attributes.n_el", "id"],
+            **params,
+        )
 
         # SQLA ORM only solution:
         # query.order_by({Pseudopotential: [{"attributes.version": {"cast": "i", "order": "desc"}}]})
@@ -245,9 +272,9 @@ class Pseudopotential(Data):
         all_iter = query.iterall()
 
         if n_el:
-            all_iter = filter(lambda p: sum(p[0].n_el) == n_el, all_iter)
+            all_iter = filter(lambda p: sum(p[2]) == n_el, all_iter)
 
-        items = sorted(all_iter, key=lambda p: p[0].version, reverse=True)
+        items = list(all_iter)
 
         if not items:
             raise NotExistent(
@@ -255,15 +282,44 @@ class Pseudopotential(Data):
             )
 
         # if we get different names there is no well ordering, sorting by version only works if they have the same name
-        if len(set(p[0].name for p in items)) > 1:
+        if any(p[0] != items[0][0] for p in items[1:]):
             raise MultipleObjectsError(
                 f"Multiple Gaussian Pseudopotentials found for element={element}, name={name}, version={version}"
             )
 
-        return items[0][0]
+        return load_node(max(items, key=lambda p: p[1])[3])
 
     @classmethod
-    def from_cp2k(cls, fhandle, filters=None, duplicate_handling="ignore", ignore_invalid=False):
+    def _get_latest_versions(cls, pseudos):
+        """
+        Get the latest stored version and UUID for each (element, name) of the given pseudopotential dicts in one query.
+
+        :param pseudos: list of dicts with at least the keys "element" and "name"
+        :return: a dict mapping (element, name) to a tuple (version, uuid)
+        """
+        latest = {}
+
+        if not pseudos:
+            return latest
+
+        query = QueryBuilder()
+        query.append(
+            Pseudopotential,
+            filters={
+                "attributes.element": {"in": list({p["element"] for p in pseudos})},
+                "attributes.name": {"in": list({p["name"] for p in pseudos})},
+            },
+            project=["attributes.element", "attributes.name", "attributes.version", "uuid"],
+        )
+
+        for element, name, version, uuid in query.iterall():
+            if (element, name) not in latest or latest[element, name][0] < version:
+                latest[element, name] = (version, uuid)
+
+        return latest
+
+    @classmethod
+    def from_cp2k(cls, fhandle, filters=None, duplicate_handling="ignore", ignore_invalid=False, store=False):
         """
         Constructs a list with pseudopotential objects from a Pseudopotential in CP2K format
 
@@ -271,60 +327,48 @@ class Pseudopotential(Data):
         :param filters: a dict with attribute filter functions
         :param duplicate_handling: how to handle duplicates ("ignore", "error", "new" (version))
         :param ignore_invalid: whether to ignore invalid entries silently
+        :param store: whether to also store all the returned nodes, in a single transaction
         :rtype: list
         """
-        from cp2k_input_tools.pseudopotentials import PseudopotentialData
+        if duplicate_handling not in ("ignore", "error", "new"):
+            raise ValueError(f"Specified duplicate handling strategy not recognized: '{duplicate_handling}'")
 
-        if not filters:
-            filters = {}
+        pseudos = (_pseudodata2dict(p) for p in PseudopotentialData.datafile_iter(fhandle, keep_going=ignore_invalid))
 
-        def matches_criteria(pseudo):
-            return all(fspec(pseudo[field]) for field, fspec in filters.items())
+        if filters:
+            # check the filters on the scalar fields first since they are the cheapest and reject most of the entries
+            filters = sorted(filters.items(), key=lambda item: item[0] not in _SCALAR_FIELDS)
+            pseudos = (p for p in pseudos if _matches_criteria(p, filters))
 
-        def exists(pseudo):
-            try:
-                cls.get(pseudo["element"], pseudo["name"], match_aliases=False)
-            except NotExistent:
-                return False
+        pseudos = list(pseudos)
 
-            return True
+        latest = cls._get_latest_versions(pseudos)
 
-        pseudos = [
-            p
-            for p in (
-                _pseudodata2dict(p) for p in PseudopotentialData.datafile_iter(fhandle, keep_going=ignore_invalid)
-            )
-            if matches_criteria(p)
-        ]
-
-        if duplicate_handling == "ignore":  # simply filter duplicates
-            pseudos = [p for p in pseudos if not exists(p)]
-
-        elif duplicate_handling == "error":
-            for pseudo in pseudos:
-                try:
-                    latest = cls.get(pseudo["element"], pseudo["name"], match_aliases=False)
-                except NotExistent:
-                    pass
-                else:
+        nodes = []
+
+        for pseudo in pseudos:
+            try:
+                version, uuid = latest[pseudo["element"], pseudo["name"]]
+            except KeyError:
+                pass
+            else:
+                if duplicate_handling == "ignore":  # simply skip duplicates
+                    continue
+
+                if duplicate_handling == "error":
                     raise UniquenessError(
                         f"Gaussian Pseudopotential already exists for"
-                        f" element={pseudo['element']}, name={pseudo['name']}: {latest.uuid}"
+                        f" element={pseudo['element']}, name={pseudo['name']}: {uuid}"
                     )
 
-        elif duplicate_handling == "new":
-            for pseudo in pseudos:
-                try:
-                    latest = cls.get(pseudo["element"], pseudo["name"], match_aliases=False)
-                except NotExistent:
-                    pass
-                else:
-                    pseudo["version"] = latest.version + 1
+                pseudo["version"] = version + 1
 
-        else:
-            raise ValueError(f"Specified duplicate handling strategy not recognized: '{duplicate_handling}'")
+            nodes.append(cls(**pseudo))
 
-        return [cls(**p) for p in pseudos]
+        if store:
+            store_in_transaction(nodes)
+
+        return nodes
 
     def to_cp2k(self, fhandle):
         """
@@ -334,9 +378,9 @@ class Pseudopotential(Data):
         """
 
         fhandle.write(f"# from AiiDA Pseudopotential<uuid: {self.uuid}>\n")
-        for line in _dict2pseudodata(self.attributes).cp2k_format_line_iter():
-            fhandle.write(line)
-            fhandle.write("\n")
+        # the attributes are only converted to the model and never handed out, so no copy of them is needed
+        data = _dict2pseudodata(self.backend_entity.attributes)
+        fhandle.write("".join(f"{line}\n" for line in data.cp2k_format_line_iter()))
 
     def get_matching_basisset(self, *args, **kwargs):
         """
@@ -351,6 +395,11 @@ class Pseudopotential(Data):
             return BasisSet.get(element=self.element, *args, **kwargs)
 
 
+def _matches_criteria(entry: Dict[str, Any], filters: List[Tuple[str, Callable[[Any], bool]]]) -> bool:
+    """check whether the given parsed entry passes all the (field, filter function) pairs, in the given order"""
+    return all(fspec(entry[field]) for field, fspec in filters)
+
+
 def _pseudodata2dict(data: PseudopotentialData) -> Dict[str, Any]:
     """
     Convert a PseudopotentialData to a compatible dict with:
@@ -359,22 +408,10 @@ def _pseudodata2dict(data: PseudopotentialData) -> Dict[str, Any]:
     * the key "coefficients" replaced with "coeffs"
     """
 
-    pseudo_dict = data.dict(by_alias=True)
-
-    stack = [pseudo_dict]
-    while stack:
-        current = stack.pop()
-        for key, val in current.items():
-            if isinstance(val, dict):
-                stack.append(val)
-            elif isinstance(val, Decimal):
-                current[key] = str(val)
-            elif isinstance(val, list) and val and isinstance(val[0], dict):
-                stack += val
-            elif isinstance(val, list) and val and isinstance(val[0], Decimal):
-                current[key] = [str(v) for v in val]
-
-    pseudo_dict["aliases"] = sorted(pseudo_dict.pop("identifiers"), key=lambda i: -len(i))
+    # the JSON round trip converts the Decimals in all nested models to strings
+    pseudo_dict = json.loads(json.dumps(data.dict(by_alias=True), default=str))
+
+    pseudo_dict["aliases"] = sorted(pseudo_dict.pop("identifiers"), key=len, reverse=True)
     pseudo_dict["name"] = pseudo_dict["aliases"][0]
     pseudo_dict["tags"] = pseudo_dict["name"].split("-")
 
@@ -7,8 +7,12 @@ Gaussian Datatype Plugin helper functions
 """
 
 
+import re
+
 import click
 
+_RANGE_SPEC = re.compile(r"^\s*(\d+)\s*(?:-\s*(\d+))?\s*$")
+
 
 def click_parse_range(value, upper_bound):
     """value_proc function to convert the given input to a list of indexes"""
@@ -18,24 +22,58 @@ def click_parse_range(value, upper_bound):
     if value.startswith("n"):
         return []
 
-    indexes = []
+    indexes = set()
+
+    for spec in value.split(","):
+        match = _RANGE_SPEC.match(spec)
+
+        if not match:
+            raise click.BadParameter("Invalid range or value specified", param=value)
+
+        begin, end = match.groups()
+
+        if end is None:
+            indexes.add(int(begin) - 1)
+        elif int(begin) > int(end):
+            raise click.BadParameter("Invalid range specified, the start is larger than the end", param=value)
+        else:
+            indexes.update(range(int(begin) - 1, int(end)))
+
+    if indexes and (min(indexes) < 0 or max(indexes) >= upper_bound):
+        raise click.BadParameter("Specified index is out of range", param=value)
+
+    return sorted(indexes)
+
+
+def store_in_transaction(nodes):
+    """
+    Store the given basis set or pseudopotential nodes in a single transaction, either all or none of them.
+
+    The uniqueness check in their store() may not see nodes stored earlier in the same transaction,
+    hence entries with the same (element, name, version) are rejected before anything is stored.
+
+    :param nodes: list of unstored nodes
+    :raises UniquenessError: if the same (element, name, version) occurs more than once
+    """
+    from aiida.common.exceptions import UniquenessError
+    from aiida.manage.manager import get_manager
+
+    seen = set()
 
-    try:
-        for spec in value.replace(" \t", "").split(","):
-            try:
-                begin, end = spec.split("-")
-            except ValueError:
-                indexes.append(int(spec) - 1)
-            else:
-                indexes += list(range(int(begin) - 1, int(end)))
+    for node in nodes:
+        key = (node.element, node.name, node.version)
 
-    except ValueError:
-        raise click.BadParameter("Invalid range or value specified", param=value)
+        if key in seen:
+            raise UniquenessError(
+                f"{type(node).__name__} found more than once for"
+                f" element={node.element}, name={node.name}, version={node.version}"
+            )
 
-    if max(indexes) >= upper_bound:
-        raise click.BadParameter("Specified index is out of range", param=max(indexes))
+        seen.add(key)
 
-    return sorted(set(indexes))
+    with get_manager().get_backend().transaction():
+        for node in nodes:
+            node.store(with_transaction=False)
 
 
 SYM2NUM = {
@@ -63,6 +63,38 @@ def test_get():
         BasisSet.get(element="H")
 
 
+def test_import_and_store():
+    BasisSet = DataFactory("gaussian.basisset")
+
+    with open(TEST_DIR.joinpath("MOLOPT_PBE.LiH"), "r") as fhandle:
+        bsets = BasisSet.from_cp2k(fhandle, store=True)
+
+    assert len(bsets) == 3
+    assert all(bset.is_stored for bset in bsets)
+    assert BasisSet.get(element="Li", name="DZVP-MOLOPT-PBE-GTH-q1").uuid in {bset.uuid for bset in bsets}
+
+
+def test_properties_stored():
+    from aiida.orm import load_node
+
+    BasisSet = DataFactory("gaussian.basisset")
+
+    with open(TEST_DIR.joinpath("BASIS_MOLOPT.H"), "r") as fhandle:
+        bset = BasisSet.from_cp2k(fhandle)[0]
+
+    properties = ("element", "name", "aliases", "tags", "version", "n_el", "blocks")
+    expected = {prop: getattr(bset, prop) for prop in properties}
+    bset.store()
+
+    loaded = load_node(bset.pk)
+    assert {prop: getattr(loaded, prop) for prop in properties} == expected
+
+    # modifying the returned values must not change the node
+    loaded.blocks.clear()
+    loaded.aliases.append("modified")
+    assert (loaded.blocks, loaded.aliases) == (expected["blocks"], expected["aliases"])
+
+
 def test_validation_empty():
     BasisSet = DataFactory("gaussian.basisset")
     bset = BasisSet()
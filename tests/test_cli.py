@@ -64,6 +64,19 @@ def test_basisset_import(run_cli_command):
     assert "2 Gaussian Basis Sets found" in result.output
 
 
+def test_basisset_import_multiple(run_cli_command):
+    result = run_cli_command(
+        import_basisset, ["--format", "cp2k", str(TEST_DIR.joinpath("MOLOPT_PBE.LiH"))], input="a\n"
+    )
+    assert not result.exception
+    assert "3 Gaussian Basis Sets found" in result.output
+    assert "Added 3 Gaussian Basis Sets" in result.output
+
+    result = run_cli_command(list_basisset)
+    assert not result.exception
+    assert "3 Gaussian Basis Sets found" in result.output
+
+
 def test_basisset_dump(run_cli_command):
     result = run_cli_command(
         import_basisset, ["--format", "cp2k", "--sym", "H", str(TEST_DIR.joinpath("BASIS_MOLOPT.H"))], input="y\n"
@@ -148,6 +161,32 @@ def test_pseudo_import(run_cli_command):
     assert "2 Gaussian Pseudopotentials found" in result.output
 
 
+def test_pseudo_import_multiple(run_cli_command):
+    result = run_cli_command(
+        import_pseudo, ["--format", "cp2k", str(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"))], input="a\n"
+    )
+    assert not result.exception
+    assert "3 Gaussian Pseudopotentials found" in result.output
+    assert "Added 3 Gaussian Pseudopotentials" in result.output
+
+    result = run_cli_command(list_pseudo)
+    assert not result.exception
+    assert "3 Gaussian Pseudopotentials found" in result.output
+
+
+def test_pseudo_import_multiple_duplicates(run_cli_command, tmp_path):
+    content = TEST_DIR.joinpath("GTH_POTENTIALS.LiH").read_text()
+    potential_file = tmp_path.joinpath("GTH_POTENTIALS")
+    potential_file.write_text(f"{content}\n{content}")
+
+    result = run_cli_command(import_pseudo, ["--format", "cp2k", str(potential_file)], input="a\n", raises=True)
+    assert "Added" not in result.output
+
+    result = run_cli_command(list_pseudo)
+    assert not result.exception
+    assert "No Gaussian Pseudopotentials found" in result.output
+
+
 def test_pseudo_dump(run_cli_command):
     result = run_cli_command(
         import_pseudo,
@@ -72,6 +72,129 @@ def test_get():
         Pseudo.get(element="Li")
 
 
+def test_duplicate_handling():
+    from aiida.common.exceptions import UniquenessError
+
+    Pseudo = DataFactory("gaussian.pseudo")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        pseudos = Pseudo.from_cp2k(fhandle)
+
+    for pseudo in pseudos:
+        pseudo.store()
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        assert not Pseudo.from_cp2k(fhandle, duplicate_handling="ignore")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        with pytest.raises(UniquenessError):
+            Pseudo.from_cp2k(fhandle, duplicate_handling="error")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        new_pseudos = Pseudo.from_cp2k(fhandle, duplicate_handling="new")
+
+    assert len(new_pseudos) == len(pseudos)
+    assert all(pseudo.version == 2 for pseudo in new_pseudos)
+
+
+def test_import_and_store():
+    Pseudo = DataFactory("gaussian.pseudo")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        pseudos = Pseudo.from_cp2k(fhandle, store=True)
+
+    assert pseudos
+    assert all(pseudo.is_stored for pseudo in pseudos)
+    assert Pseudo.get(element="Li", name="GTH-PBE-q1").uuid in {pseudo.uuid for pseudo in pseudos}
+
+
+def test_import_and_store_rollback(monkeypatch):
+    from aiida.orm import QueryBuilder
+
+    Pseudo = DataFactory("gaussian.pseudo")
+    validate = Pseudo._validate
+
+    def _validate(self):
+        # fail on the Li entries, which come after the H entry in the file
+        if self.element == "Li":
+            raise ValidationError("invalid")
+        validate(self)
+
+    monkeypatch.setattr(Pseudo, "_validate", _validate)
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        with pytest.raises(ValidationError):
+            Pseudo.from_cp2k(fhandle, store=True)
+
+    assert not QueryBuilder().append(Pseudo).count()
+
+
+def test_import_and_store_duplicates():
+    from aiida.common.exceptions import UniquenessError
+    from aiida.orm import QueryBuilder
+
+    Pseudo = DataFactory("gaussian.pseudo")
+    content = TEST_DIR.joinpath("GTH_POTENTIALS.LiH").read_text()
+
+    with pytest.raises(UniquenessError):
+        Pseudo.from_cp2k(io.StringIO(f"{content}\n{content}"), store=True)
+
+    assert not QueryBuilder().append(Pseudo).count()
+
+
+_PROPERTIES = ("element", "name", "aliases", "tags", "version", "n_el", "local", "non_local", "nlcc")
+
+
+def test_properties_unstored():
+    Pseudo = DataFactory("gaussian.pseudo")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        pseudo = Pseudo.from_cp2k(fhandle)[0]
+
+    assert pseudo.version == 1 and pseudo.tags == ["GTH", "PBE", "q1"]
+
+    pseudo.set_attribute("version", 2)
+    pseudo.set_attribute("tags", ["GTH"])
+
+    assert pseudo.version == 2 and pseudo.tags == ["GTH"]
+
+
+def test_properties_stored():
+    from aiida.orm import load_node
+
+    Pseudo = DataFactory("gaussian.pseudo")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        pseudo = Pseudo.from_cp2k(fhandle)[0]
+
+    expected = {prop: getattr(pseudo, prop) for prop in _PROPERTIES}
+    pseudo.store()
+
+    assert {prop: getattr(pseudo, prop) for prop in _PROPERTIES} == expected
+    loaded = load_node(pseudo.pk)
+    assert {prop: getattr(loaded, prop) for prop in _PROPERTIES} == expected
+
+
+def test_properties_stored_copies():
+    from aiida.orm import load_node
+
+    Pseudo = DataFactory("gaussian.pseudo")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        pseudo = Pseudo.from_cp2k(fhandle)[0]
+
+    pseudo.store()
+    loaded = load_node(pseudo.pk)
+    tags, local, non_local = loaded.tags, loaded.local, loaded.non_local
+
+    loaded.tags.append("modified")
+    loaded.local.clear()
+    loaded.non_local.clear()
+
+    assert (loaded.tags, loaded.local, loaded.non_local) == (tags, local, non_local)
+    assert loaded.attributes["tags"] == tags
+
+
 def test_validation_empty():
     Pseudo = DataFactory("gaussian.pseudo")
     pseudo = Pseudo()
@@ -125,3 +248,22 @@ def test_to_cp2k_nlcc_missing():
         pseudo.to_cp2k(fhandle)
 
     assert fhandle.getvalue()
+
+
+def test_to_cp2k_stored():
+    """Check that writing a stored node works and leaves its attributes untouched"""
+    from aiida.orm import load_node
+
+    Pseudo = DataFactory("gaussian.pseudo")
+
+    with open(TEST_DIR.joinpath("GTH_POTENTIALS.LiH"), "r") as fhandle:
+        pseudo = Pseudo.from_cp2k(fhandle, store=True)[0]
+
+    loaded = load_node(pseudo.pk)
+    attributes = loaded.attributes
+
+    fhandle = io.StringIO()
+    loaded.to_cp2k(fhandle)
+
+    assert f"{loaded.element} {loaded.name}" in fhandle.getvalue()
+    assert loaded.attributes == attributes
@@ -0,0 +1,17 @@
+import click
+import pytest
+
+from aiida_gaussian_datatypes.utils import click_parse_range
+
+
+def test_click_parse_range():
+    assert click_parse_range("1, 3-5", 6) == [0, 2, 3, 4]
+    assert click_parse_range(" 2 - 3 ,2", 6) == [1, 2]
+    assert list(click_parse_range("all", 3)) == [0, 1, 2]
+    assert click_parse_range("none", 3) == []
+
+
+@pytest.mark.parametrize("value", ["0", "7", "2-7", "4-2", "x", "1-", ""])
+def test_click_parse_range_invalid(value):
+    with pytest.raises(click.BadParameter):
+        click_parse_range(value, 6)